@@ -1 +1 @@
-from . import ces, layout, utils, text, drawing
\ No newline at end of file
+from . import ces, layout, utils, text, drawing, analysis
\ No newline at end of file
@@ -0,0 +1,211 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+from . import ces, utils
+
+
+#################
+# SPARSE EXPORT #
+#################
+
+def ces_mechanisms(graphs):
+    '''
+    Returns mechanism labels of a list of ces-graphs in order of first appearance.
+    '''
+    mechanisms = {}
+    for G in graphs:
+        for m in G.nodes:
+            mechanisms.setdefault(m, len(mechanisms))
+    return list(mechanisms)
+
+def graph_to_sparse(G, mechanisms, facecolor_attribute=None):
+    '''
+    Export ces-graph to sparse adjacency matrices.
+
+    Each face (edge) u -> v adds 1 to A[u, v], so parallel edges of multigraphs
+    become integer multiplicities. Undirected faces are stored once, in the
+    upper triangle (row <= col) (see symmetrize).
+
+    Parameters
+    ----------
+    G : networkx graph
+    mechanisms : list of mechanism labels, aligned with the rows/cols of the matrices
+    facecolor_attribute : str, if given, the matrix is split by this edge attribute
+
+    Returns
+    -------
+    dict[color] --> scipy.sparse.csr_matrix (color is None if facecolor_attribute is None)
+    '''
+    mech2ix = {m: i for i, m in enumerate(mechanisms)}
+    n = len(mechanisms)
+
+    def _to_csr(rows, cols):
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        data = np.ones(len(rows), dtype=np.int64)
+        return sparse.coo_matrix((data, (rows, cols)), shape=(n, n)).tocsr()  # sums duplicates
+
+    edges = G.edges(data=facecolor_attribute) if facecolor_attribute is not None else ((u, v, None) for u, v in G.edges())
+    edges_by_color = {}
+    for u, v, c in edges:
+        rows, cols = edges_by_color.setdefault(c, ([], []))
+        rows.append(mech2ix[u])
+        cols.append(mech2ix[v])
+    if facecolor_attribute is None and not edges_by_color:
+        edges_by_color[None] = ([], [])
+    if not G.is_directed():  # canonical orientation, independent of networkx edge order
+        edges_by_color = {c: (np.minimum(rows, cols), np.maximum(rows, cols)) for c, (rows, cols) in edges_by_color.items()}
+    return {c: _to_csr(rows, cols) for c, (rows, cols) in edges_by_color.items()}
+
+def ces_to_sparse(CES, mechanisms=None, facecolor_attribute='color'):
+    '''
+    Export CES dict to sparse adjacency matrices per face degree and color.
+
+    Parameters
+    ----------
+    CES : dict[face-degree] --> networkx graph
+    mechanisms : list of mechanism labels (defaults to the nodes of the CES)
+    facecolor_attribute : str (if None, the only color is None)
+
+    Returns
+    -------
+    mechanisms : list of mechanism labels, aligned with the rows/cols of the matrices
+    sCES : dict[face-degree][color] --> scipy.sparse.csr_matrix of face multiplicities
+    '''
+    if mechanisms is None:
+        mechanisms = ces_mechanisms(CES.values())
+    sCES = {n: graph_to_sparse(G, mechanisms, facecolor_attribute=facecolor_attribute) for n, G in CES.items()}
+    return mechanisms, sCES
+
+def decomposed_ces_to_sparse(dCES, mechanisms=None):
+    '''
+    Export decomposed CES (see ces.decompose_ces_by_facecolor) to sparse adjacency matrices.
+
+    Parameters
+    ----------
+    dCES : dict[face-degree][color] --> networkx graph
+    mechanisms : list of mechanism labels (defaults to the nodes of the dCES)
+
+    Returns
+    -------
+    mechanisms : list of mechanism labels, aligned with the rows/cols of the matrices
+    sCES : dict[face-degree][color] --> scipy.sparse.csr_matrix of face multiplicities
+    '''
+    if mechanisms is None:
+        mechanisms = ces_mechanisms(G for dG in dCES.values() for G in dG.values())
+    sCES = {n: {c: graph_to_sparse(G, mechanisms)[None] for c, G in dG.items()} for n, dG in dCES.items()}
+    return mechanisms, sCES
+
+def faces_to_sparse(faces, mechanisms=None, invert_3face_edge=True):
+    '''
+    Export face arrays (see ces.classify_faces) of 2-relations to sparse adjacency matrices
+    per face degree and color, with the same edges as ces.create_ces_graph (see ces.face_edges).
+    As in graph_to_sparse, the undirected 4-faces are stored in the upper triangle.
+
+    Parameters
+    ----------
+    faces : dict of face arrays
+    mechanisms : list of mechanism labels (defaults to the mechanisms of the faces)
+    invert_3face_edge : bool
+
+    Returns
+    -------
+    mechanisms : list of mechanism labels, aligned with the rows/cols of the matrices
+    sCES : dict[face-degree][color] --> scipy.sparse.csr_matrix of face multiplicities
+    '''
+    face_labels = [utils.node_ixs2label(m, faces['node_labels']) for m in faces['mechanisms']]
+    if mechanisms is None:
+        mechanisms = face_labels
+    mech2ix = {m: i for i, m in enumerate(mechanisms)}
+    face2ix = np.array([mech2ix[m] for m in face_labels], dtype=np.intp)  # face mechanism ids --> rows/cols
+    n = len(mechanisms)
+
+    sCES = {}
+    for d, (_, tails, heads, colors) in ces.face_edges(faces, invert_3face_edge=invert_3face_edge).items():
+        rows, cols = face2ix[tails], face2ix[heads]
+        if d == 4:  # undirected
+            rows, cols = np.minimum(rows, cols), np.maximum(rows, cols)
+        colors = np.asarray(colors)
+        sCES[d] = {}
+        for c in dict.fromkeys(colors.tolist()):  # colors in order of first appearance
+            is_c = colors == c
+            data = np.ones(np.count_nonzero(is_c), dtype=np.int64)
+            sCES[d][c] = sparse.coo_matrix((data, (rows[is_c], cols[is_c])), shape=(n, n)).tocsr()  # sums duplicates
+    return mechanisms, sCES
+
+######################
+# SUMMARY STATISTICS #
+######################
+
+def sum_adjacency(sCES, face_degrees=None, colors=None):
+    '''
+    Sum adjacency matrices over face degrees and colors (all by default).
+    '''
+    As = [A for n, dA in sCES.items() if face_degrees is None or n in face_degrees
+          for c, A in dA.items() if colors is None or c in colors]
+    n_mechs = As[0].shape[0] if As else 0
+    total = sparse.csr_matrix((n_mechs, n_mechs), dtype=np.int64)
+    for A in As:
+        total = total + A
+    return total
+
+def face_counts(sCES):
+    '''
+    Number of faces per face degree and color.
+
+    Returns
+    -------
+    dict[face-degree][color] --> int
+    '''
+    return {n: {c: int(A.sum()) for c, A in dA.items()} for n, dA in sCES.items()}
+
+def symmetrize(A):
+    '''
+    Symmetric adjacency of an undirected face matrix (A + A.T, diagonal counted once).
+    '''
+    return A + A.T - sparse.diags(A.diagonal(), format='csr', dtype=A.dtype)
+
+def out_degrees(A):
+    '''
+    Out-degree of each mechanism. Only meaningful for directed face graphs, since
+    undirected faces are stored in the upper triangle (use degrees instead).
+    '''
+    return np.asarray(A.sum(axis=1)).ravel()
+
+def in_degrees(A):
+    '''
+    In-degree of each mechanism. Only meaningful for directed face graphs, since
+    undirected faces are stored in the upper triangle (use degrees instead).
+    '''
+    return np.asarray(A.sum(axis=0)).ravel()
+
+def degrees(A):
+    '''
+    Total degree of each mechanism, independent of edge orientation
+    (self-loops count twice, as in networkx).
+    '''
+    return out_degrees(A) + in_degrees(A)
+
+def degree_distribution(A):
+    '''
+    Returns array where entry k is the number of mechanisms with degree k.
+    '''
+    return np.bincount(degrees(A))
+
+def connected_components(A):
+    '''
+    Weakly connected components of the adjacency matrix.
+
+    Returns
+    -------
+    n_components : int
+    labels : array with component of each mechanism
+    '''
+    return csgraph.connected_components(A, directed=True, connection='weak')
+
+def component_sizes(A):
+    '''
+    Returns size of each weakly connected component, in decreasing order.
+    '''
+    _, labels = connected_components(A)
+    return np.sort(np.bincount(labels))[::-1]
@@ -4,7 +4,7 @@ from copy import deepcopy
 import numpy as np
 import pyphi
 
-def create_ces_graph(distinctions, relations=None, invert_3face_edge=True):
+def create_ces_graph(distinctions, relations=None, invert_3face_edge=True, faces=None, table=None):
     '''
     Create CES dict.
 
@@ -14,6 +14,8 @@ def create_ces_graph(distinctions, relations=None, invert_3face_edge=True):
     ----------
     distinctions
     relations
+    faces : dict of face arrays (see classify_faces), computed from relations if not given
+    table : utils.MechanismTable used to label the distinctions (defaults to the shared table of the node labels)
 
     Returns
     -------
@@ -22,57 +24,17 @@ def create_ces_graph(distinctions, relations=None, invert_3face_edge=True):
 
     def _add_distinctions(G, distinctions):
         for d in distinctions:
-            attr = dict(phi=d.phi, node_indices=d.mechanism,
-                        node_label=utils.node_ixs2label(d.mechanism, d.node_labels))
-            G.add_node(utils.node_ixs2label(d.mechanism, d.node_labels), **attr)
+            mech_label = table.label(d.mechanism)
+            attr = dict(phi=d.phi, node_indices=d.mechanism, node_label=mech_label)
+            G.add_node(mech_label, **attr)
         return G
 
-    def _add_4face_edge():
-        CES[4].add_edge(mech_label1, mech_label2, color='blue', purview=face.purview)
-
-    def _add_3face_edge(invert_3face_edge):
-        triangle_type = eval_rel_3face_type(face)
-        edge_color = 'green' if triangle_type == 'effect' else 'red'
-
-        base_mech = eval_rel_3face_base(face)
-
-        if not invert_3face_edge: # original
-            if base_mech == mech1:
-                arrow_base_label = mech_label1
-                arrow_point_label = mech_label2
-            elif base_mech == mech2:
-                arrow_base_label = mech_label2
-                arrow_point_label = mech_label1
-            else:
-                raise ValueError(f'Inconsistent mechanisms ({mech1}, {mech2}) and {base_mech}')
-        else: # new proposed convention
-            if base_mech == mech1:
-                arrow_base_label = mech_label2
-                arrow_point_label = mech_label1
-            elif base_mech == mech2:
-                arrow_base_label = mech_label1
-                arrow_point_label = mech_label2
-            else:
-                raise ValueError(f'Inconsistent mechanisms ({mech1}, {mech2}) and {base_mech}')
-
-        CES[3].add_edge(arrow_base_label, arrow_point_label, color=edge_color, purview=face.purview)
-
-    def _add_2face_edge():
-        face_type = eval_rel_2face_type(face)
-        if face_type=='effect_effect':
-            CES[2].add_edge(mech_label1, mech_label2, color='green', purview=face.purview)
-            # CES[2].add_edge(mech_label2, mech_label1, color='green', purview=face.purview)
-
-        elif face_type=='cause_cause':
-            CES[2].add_edge(mech_label1, mech_label2, color='red', purview=face.purview)
-            # CES[2].add_edge(mech_label2, mech_label1, color='red', purview=face.purview)
-
-        elif face_type=='cause_effect':
-            CES[2].add_edge(mech_label1, mech_label2, color='orange', purview=face.purview)
-        else: # effect_cause
-            CES[2].add_edge(mech_label2, mech_label1, color='orange', purview=face.purview)
-
-    relations = filter_relations_by_degree(relations, 2)  # filter 2-relations
+    if faces is None:
+        relations = filter_relations_by_degree(relations, 2)  # filter 2-relations
+        faces = classify_faces(relations)
+
+    if table is None and distinctions:
+        table = utils.get_mechanism_table(distinctions[0].node_labels)
 
     CES = {}
     # 4-face graph
@@ -88,25 +50,62 @@ def create_ces_graph(distinctions, relations=None, invert_3face_edge=True):
     CES[2] = _add_distinctions(G, distinctions)
 
     # ADD RELATIONS
-    for rel in relations:
-        distinction1, distinction2 = list(rel)
-        mech1, mech2 = distinction1.mechanism, distinction2.mechanism
-        mech_label1, mech_label2 = utils.nodes_ixs2label([mech1, mech2], distinction1.node_labels)
-
-        sorted_faces = sorted(list(rel.faces), key=len, reverse=True)
-
-        for face in sorted_faces:
-            face_degree = len(face)
-            if face_degree == 4:
-                _add_4face_edge()
-            elif face_degree == 3:
-                _add_3face_edge(invert_3face_edge=invert_3face_edge)
-            elif face_degree==2:
-                _add_2face_edge()
-            else:
-                pass
+    labels = [utils.node_ixs2label(m, faces['node_labels']) for m in faces['mechanisms']]  # face ids --> labels
+    purviews = faces['purview']
+    for n, (ixs, tails, heads, colors) in face_edges(faces, invert_3face_edge=invert_3face_edge).items():
+        CES[n].add_edges_from((labels[t], labels[h], dict(color=c, purview=purviews[k]))
+                              for k, t, h, c in zip(ixs, tails, heads, colors))
     return CES
 
+def face_edges(faces, invert_3face_edge=True):
+    '''
+    Edges of the CES graphs of the 2-relation faces in face arrays (see classify_faces),
+    with the orientation and face colors used by create_ces_graph.
+
+    Parameters
+    ----------
+    faces : dict of face arrays
+    invert_3face_edge : bool, 3-face arrows point to the base mechanism (see create_ces_graph)
+
+    Returns
+    -------
+    dict[face-degree] --> (ixs, tails, heads, colors), i.e. face indices, mechanism ids of
+    the edge tails and heads (ids of faces['mechanisms']) and list of edge colors
+    '''
+    mech1, mech2 = faces['mech1_id'], faces['mech2_id']
+    is_2relation = (mech1 >= 0) & (mech2 >= 0)
+    edges = {}
+
+    # 4-faces
+    ixs = np.flatnonzero(is_2relation & (faces['degree'] == 4))
+    edges[4] = (ixs, mech1[ixs], mech2[ixs], ['blue'] * len(ixs))
+
+    # 3-faces
+    ixs = np.flatnonzero(is_2relation & (faces['degree'] == 3))
+    base = faces['base_mech_id'][ixs]
+    base_is_mech1 = base == mech1[ixs]
+    inconsistent = ~base_is_mech1 & (base != mech2[ixs])
+    if np.any(inconsistent):
+        j = np.argmax(inconsistent)
+        mechanisms = faces['mechanisms']
+        base_mech = mechanisms[base[j]] if base[j] >= 0 else None
+        raise ValueError(f'Inconsistent mechanisms ({mechanisms[mech1[ixs[j]]]}, {mechanisms[mech2[ixs[j]]]}) and {base_mech}')
+    point_is_mech1 = base_is_mech1 if invert_3face_edge else ~base_is_mech1  # invert: new proposed convention
+    tails = np.where(point_is_mech1, mech2[ixs], mech1[ixs])
+    heads = np.where(point_is_mech1, mech1[ixs], mech2[ixs])
+    colors = np.where(faces_3face_type(faces)[ixs] == 'effect', 'green', 'red').tolist()
+    edges[3] = (ixs, tails, heads, colors)
+
+    # 2-faces
+    ixs = np.flatnonzero(is_2relation & (faces['degree'] == 2))
+    codes = faces['direction_code'][ixs]
+    is_effect_cause = codes == FACE2_CODES['effect_cause']
+    tails = np.where(is_effect_cause, mech2[ixs], mech1[ixs])
+    heads = np.where(is_effect_cause, mech1[ixs], mech2[ixs])
+    colors = np.array(FACE2_COLORS)[codes].tolist()
+    edges[2] = (ixs, tails, heads, colors)
+    return edges
+
 def eval_rel_2face_type(face):
     '''
     Returns whether relation 2-face is c-c, e-e, c-e or e-c.
@@ -171,13 +170,172 @@ def eval_rel_3face_base(face):
         base_mech = unique_mechs[1]
     return base_mech
 
+# 2-face types indexed by direction code (bit k set if k-th purview of the face is an effect)
+FACE2_TYPES = ('cause_cause', 'effect_cause', 'cause_effect', 'effect_effect')
+FACE2_CODES = {t: code for code, t in enumerate(FACE2_TYPES)}
+FACE2_COLORS = ('red', 'orange', 'orange', 'green')
+
+def classify_faces(relations, node_labels=None):
+    '''
+    Classify all faces of a relation set at once.
+
+    Faces are flattened in relation order and, within a relation, in list(relation.faces)
+    order. Purviews within a face are taken in list(face) order, as in the per-face
+    functions (eval_rel_2face_type, eval_rel_3face_type and eval_rel_3face_base).
+    The returned dict can be saved (utils.save_pickle) and passed to create_ces_graph.
+
+    Parameters
+    ----------
+    relations : list of relations
+    node_labels : list of str (defaults to the node labels of the first distinction)
+
+    Returns
+    -------
+    faces : dict with
+        'relation_ix' : int array, index of the relation of each face
+        'degree' : int array, face degree
+        'direction_code' : int array, bit k set if k-th purview is an effect
+        'base_mech_id' : int array, mechanism id of distinction with two purviews in 3-faces
+                         (-1 for other degrees or 3-faces without exactly two distinct mechanisms)
+        'purview_mask' : int array, bitmask of the face (overlap) purview
+        'mech1_id', 'mech2_id' : int arrays, mechanism ids of 2-relations (-1 otherwise)
+        'purview' : object array, face purviews
+        'mechanisms' : tuple of the relations' mechanisms (tuples of node indices) the ids refer to
+        'node_labels' : tuple of str
+    '''
+    if node_labels is None:
+        node_labels = list(relations[0])[0].node_labels if relations else ()
+    table = utils.MechanismTable(node_labels)  # local: ids index the mechanisms of these relations only
+
+    is_effect = {}  # direction --> bool, cached to avoid str comparisons per purview
+
+    def _is_effect(direction):
+        flag = is_effect.get(direction)
+        if flag is None:
+            name = str(direction)
+            if name not in ('CAUSE', 'EFFECT'):
+                raise ValueError(f'Weird purview direction: {name}')
+            flag = is_effect[direction] = name == 'EFFECT'
+        return flag
+
+    relation_ix, degree, direction_code, base_mech_id = [], [], [], []
+    purview_mask, mech1_id, mech2_id, purview = [], [], [], []
+    for i, rel in enumerate(relations):
+        rel_distinctions = list(rel)
+        if len(rel_distinctions) == 2:
+            m1, m2 = table.intern(rel_distinctions[0].mechanism), table.intern(rel_distinctions[1].mechanism)
+        else:
+            m1, m2 = -1, -1
+
+        for face in rel.faces:
+            face_purviews = list(face)
+            code = 0
+            for k, p in enumerate(face_purviews):
+                if _is_effect(p.direction):
+                    code |= 1 << k
+
+            base = -1
+            if len(face_purviews) == 3:
+                mechs = [p.mechanism for p in face_purviews]
+                if len(set(mechs)) == 2:
+                    base = table.intern(mechs[0] if mechs[0] in (mechs[1], mechs[2]) else mechs[1])
+
+            relation_ix.append(i)
+            degree.append(len(face_purviews))
+            direction_code.append(code)
+            base_mech_id.append(base)
+            purview_mask.append(table.purview_mask(face.purview))
+            mech1_id.append(m1)
+            mech2_id.append(m2)
+            purview.append(face.purview)
+
+    purview_array = np.empty(len(purview), dtype=object)
+    purview_array[:] = purview
+    return {'relation_ix': np.array(relation_ix, dtype=np.int64),
+            'degree': np.array(degree, dtype=np.int64),
+            'direction_code': np.array(direction_code, dtype=np.int64),
+            'base_mech_id': np.array(base_mech_id, dtype=np.int64),
+            'purview_mask': np.array(purview_mask, dtype=np.int64),
+            'mech1_id': np.array(mech1_id, dtype=np.int64),
+            'mech2_id': np.array(mech2_id, dtype=np.int64),
+            'purview': purview_array,
+            'mechanisms': tuple(table.mechanisms),
+            'node_labels': table.node_labels}
+
+def select_faces(faces, ixs):
+    '''
+    Select subset of face arrays by boolean mask or indices (e.g. faces['degree'] == 3).
+    '''
+    return {k: v[ixs] if isinstance(v, np.ndarray) else v for k, v in faces.items()}
+
+def n_effect_purviews(faces):
+    '''
+    Number of effect purviews of each face.
+    '''
+    codes = faces['direction_code']
+    return sum((codes >> k) & 1 for k in range(int(faces['degree'].max(initial=0))))
+
+def faces_2face_type(faces):
+    '''
+    Vectorized eval_rel_2face_type: array of 2-face types ('' for faces of other degree).
+    '''
+    types = np.array(FACE2_TYPES + ('',))
+    return types[np.where(faces['degree'] == 2, faces['direction_code'], len(FACE2_TYPES))]
+
+def faces_3face_type(faces):
+    '''
+    Vectorized eval_rel_3face_type: array of 'cause'/'effect' ('' for faces of other degree).
+    '''
+    types = np.where(faces['degree'] - n_effect_purviews(faces) == 2, 'cause', 'effect')
+    return np.where(faces['degree'] == 3, types, '')
+
+def _same_relation_face_pairs(relation_ix):
+    '''
+    Returns indices (i, j) of all ordered pairs of faces in the same relation.
+    '''
+    order = np.argsort(relation_ix, kind='stable')
+    rel = relation_ix[order]
+    starts = np.flatnonzero(np.r_[True, rel[1:] != rel[:-1]]) if len(rel) else np.array([], dtype=np.int64)
+    sizes = np.diff(np.r_[starts, len(rel)])
+
+    group_size = np.repeat(sizes, sizes)  # per (sorted) face: size of its relation group
+    group_start = np.repeat(starts, sizes)
+    i = np.repeat(np.arange(len(rel)), group_size)
+    j = np.repeat(group_start, group_size) + np.arange(len(i)) - np.repeat(np.cumsum(group_size) - group_size, group_size)
+    return order[i], order[j]
+
+def filter_faces_by_higher_face_purview_overlap(faces):
+    '''
+    Face-array version of filter_ces_by_higher_face_purview_overlap: a face is removed
+    if its purview is a subset of the purview of a higher degree face of the same relation.
+
+    Parameters
+    ----------
+    faces : dict of face arrays (see classify_faces)
+
+    Returns
+    -------
+    filtered face arrays
+    '''
+    i, j = _same_relation_face_pairs(faces['relation_ix'])
+    masks = faces['purview_mask']
+    is_covered = (faces['degree'][j] > faces['degree'][i]) & ((masks[i] & ~masks[j]) == 0)
+
+    removed = np.zeros(len(masks), dtype=bool)
+    removed[i[is_covered]] = True
+    return select_faces(faces, ~removed)
+
 def get_max_face(relation):
     '''Returns face with largest degree.'''
     i = np.argmax([len(f) for f in relation.faces])
     return list(relation.faces)[i]
 
-def filter_contiguous_distinctions(distinctions):
-    return [d for d in distinctions if utils.is_contiguous(d.mechanism)]
+def filter_contiguous_distinctions(distinctions, table=None):
+    if not distinctions:
+        return []
+    if table is None:
+        table = utils.get_mechanism_table(distinctions[0].node_labels)
+    return [d for d in distinctions if table.is_contiguous(d.mechanism)]
 
 def filter_relations_by_degree(relations, degree):
     '''
@@ -1,6 +1,11 @@
 from . import layout, utils
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_hex
 import networkx as nx
+import numpy as np
+from xml.sax.saxutils import escape
+
+DECOMPOSED_FACECOLOR_SUBTITLES = [['Full'], ['Effect dominated', 'Cause dominated'], ['Effect-Effect', 'Cause-Cause', 'Cause to Effect']]
 
 
 
@@ -65,7 +70,7 @@ def plot_graph(G,
     # nx.draw_networkx_edge_labels(CES[3], pos, edge_labels=edge_labels)
 
 def plot_decomposed_facecolor_ces_graph(dCES, pos, pos_labels=None, figsize=(25, 25)):
-    subtitles = [['Full'],['Effect dominated', 'Cause dominated'], ['Effect-Effect', 'Cause-Cause', 'Cause to Effect']]
+    subtitles = DECOMPOSED_FACECOLOR_SUBTITLES
     fig, axes = plt.subplots(nrows=3, ncols=3, figsize=figsize)
 
     for i, (n, dG) in enumerate(dCES.items()):
@@ -77,4 +82,119 @@ def plot_decomposed_facecolor_ces_graph(dCES, pos, pos_labels=None, figsize=(25,
     fig.delaxes(axes[0][1])
     fig.delaxes(axes[0][2])
     fig.delaxes(axes[1][2])
-    plt.tight_layout()
\ No newline at end of file
+    plt.tight_layout()
+
+def save_decomposed_facecolor_ces_svg(dCES,
+                                      pos,
+                                      fpath,
+                                      pos_labels=None,
+                                      panel_size=800,
+                                      node_color='tab:blue',
+                                      node_radius=9,
+                                      node_label_fontsize=12,
+                                      edgecolor_field=None,
+                                      edgecolor='lightgray',
+                                      margins=0.2):
+    '''
+    Save decomposed CES as SVG, in the same 3x3 panel arrangement as plot_decomposed_facecolor_ces_graph.
+
+    The SVG is written incrementally while iterating the edges, so memory stays
+    bounded regardless of the number of edges (no matplotlib figure is created).
+
+    Parameters
+    ----------
+    dCES : dict[face-degree][color] --> networkx graph (see ces.decompose_ces_by_facecolor)
+    pos : dict[node] = (x, y)
+    fpath : str or Path
+    pos_labels : dict[node] = (x, y)
+    panel_size : int, size of each panel in px
+    edgecolor_field : str, edge attribute with the edge color (if None, edgecolor is used)
+    margins : float, fraction of the panel left as margin
+    '''
+    subtitles = DECOMPOSED_FACECOLOR_SUBTITLES
+    title_height = 2 * node_label_fontsize
+
+    # pos --> panel px (y axis flipped, equal aspect)
+    xy = np.array([list(p) for p in pos.values()] + ([list(p) for p in pos_labels.values()] if pos_labels else []), dtype=float)
+    xy_min, xy_max = xy.min(axis=0), xy.max(axis=0)
+    center = (xy_min + xy_max) / 2
+    span = max(np.max(xy_max - xy_min), 1e-12)
+    drawing_size = panel_size - title_height
+    scale = drawing_size * (1 - 2 * margins) / span
+
+    def _to_px(p):
+        x = panel_size / 2 + (p[0] - center[0]) * scale
+        y = title_height + drawing_size / 2 - (p[1] - center[1]) * scale
+        return x, y
+
+    node_px = {node: _to_px(p) for node, p in pos.items()}
+    label_px = {node: _to_px(p) for node, p in pos_labels.items()} if pos_labels is not None else None
+    node_fill = to_hex(node_color)
+    default_stroke = to_hex(edgecolor)
+
+    with open(fpath, 'w') as f:
+        width, height = 3 * panel_size, 3 * panel_size
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">\n')
+        f.write(f'<rect width="{width}" height="{height}" fill="white"/>\n')
+
+        arrow_markers = set()  # stroke colors with an arrow marker already defined
+        for i, (n, dG) in enumerate(dCES.items()):
+            for j, (c, G) in enumerate(dG.items()):
+                f.write(f'<g transform="translate({j * panel_size},{i * panel_size})">\n')
+                f.write(f'<text x="{panel_size / 2}" y="{1.5 * node_label_fontsize}" font-family="sans-serif" '
+                        f'font-size="{1.2 * node_label_fontsize}" text-anchor="middle">{escape(f"{subtitles[i][j]} {n}-Face")}</text>\n')
+                _write_svg_graph(f, G, node_px, label_px, node_fill, node_radius, node_label_fontsize,
+                                 edgecolor_field, default_stroke, arrow_markers)
+                f.write('</g>\n')
+        f.write('</svg>\n')
+
+def _write_svg_graph(f, G, node_px, label_px, node_fill, node_radius, node_label_fontsize, edgecolor_field,
+                     default_stroke, arrow_markers):
+    '''
+    Write edges, nodes and labels of G as SVG elements to file object f, one element at a time.
+
+    Arrow markers are defined lazily, one per stroke color (SVG 1.1 has no context-stroke),
+    and their colors are added to arrow_markers.
+    '''
+    stroke_colors = {}  # color name --> hex, cached since edges repeat a few colors
+
+    def _marker(stroke):
+        if not G.is_directed():
+            return ''
+        marker_id = f'arrow-{stroke[1:]}'
+        if stroke not in arrow_markers:
+            arrow_markers.add(stroke)
+            f.write(f'<defs><marker id="{marker_id}" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="6" '
+                    f'markerHeight="6" orient="auto"><path d="M 0 0 L 10 5 L 0 10 z" fill="{stroke}"/></marker></defs>\n')
+        return f' marker-end="url(#{marker_id})"'
+
+    edges = G.edges(data=edgecolor_field) if edgecolor_field is not None else ((u, v, None) for u, v in G.edges())
+    for u, v, color in edges:
+        if color is None:
+            stroke = default_stroke
+        else:
+            stroke = stroke_colors.get(color)
+            if stroke is None:
+                stroke = stroke_colors[color] = to_hex(color)
+        marker = _marker(stroke)
+        (x1, y1), (x2, y2) = node_px[u], node_px[v]
+        if u == v:  # self-loop above the node
+            r = node_radius
+            f.write(f'<path d="M {x1 - 0.6 * r:.2f} {y1 - 0.8 * r:.2f} C {x1 - 2.5 * r:.2f} {y1 - 4 * r:.2f} '
+                    f'{x1 + 2.5 * r:.2f} {y1 - 4 * r:.2f} {x1 + 0.6 * r:.2f} {y1 - 0.8 * r:.2f}" '
+                    f'fill="none" stroke="{stroke}"{marker}/>\n')
+            continue
+        if G.is_directed() and (x1, y1) != (x2, y2):  # stop arrow at node border
+            d = np.hypot(x2 - x1, y2 - y1)
+            x2, y2 = x2 - (x2 - x1) * node_radius / d, y2 - (y2 - y1) * node_radius / d
+        f.write(f'<line x1="{x1:.2f}" y1="{y1:.2f}" x2="{x2:.2f}" y2="{y2:.2f}" stroke="{stroke}"{marker}/>\n')
+
+    for node in G.nodes:
+        x, y = node_px[node]
+        f.write(f'<circle cx="{x:.2f}" cy="{y:.2f}" r="{node_radius}" fill="{node_fill}" stroke="black"/>\n')
+
+    if label_px is not None:
+        for node in G.nodes:
+            x, y = label_px[node]
+            f.write(f'<text x="{x:.2f}" y="{y:.2f}" font-family="sans-serif" font-size="{node_label_fontsize}" '
+                    f'text-anchor="middle" dominant-baseline="central">{escape(str(node))}</text>\n')
@@ -27,13 +27,15 @@ def offset_pos(pos, x=0, y=0):
 def circular_layout(G, scale=1, center=None, dim=2):
     return nx.layout.circular_layout(G, scale=scale, center=center, dim=dim)
 
-def hasse_layout(G, node_labels, warp=0.):
+def hasse_layout(G, node_labels, warp=0., table=None):
     n_nodes = len(node_labels)
-    pos = _hasse_layout(n_nodes, warp=warp)
-    pos = {utils.node_ixs2label(mech, node_labels): xy for mech, xy in pos.items()}
+    if table is None:
+        table = utils.MechanismTable(node_labels)  # local: all subsets are interned
+    pos = _hasse_layout(n_nodes, warp=warp, table=table)
+    pos = {table.label(mech): xy for mech, xy in pos.items()}
     return pos
 
-def _hasse_layout(n_elements, warp=0, triangle_base=1, warp_mode='exponential'):
+def _hasse_layout(n_elements, warp=0, triangle_base=1, warp_mode='exponential', table=None):
     '''
     Generates the Hasse diagram layout out of the contiguous sets in the powerset of 'n_elements'.
 
@@ -42,6 +44,7 @@ def _hasse_layout(n_elements, warp=0, triangle_base=1, warp_mode='exponential'):
     n_elements : int
     warp : 0 < float
     triangle_base : float
+    table : utils.MechanismTable, table of the subsystem (defaults to a local one)
 
     Returns
     -------
@@ -51,7 +54,10 @@ def _hasse_layout(n_elements, warp=0, triangle_base=1, warp_mode='exponential'):
 
     all_sets = [list(itertools.combinations(range(n_elements), n)) for n in range(1, n_elements + 1)]  # list of lists
 
-    contiguous_sets = [[x for x in sets if utils.is_contiguous(x)] for sets in all_sets]
+    if table is None:
+        table = utils.MechanismTable([str(i) for i in range(n_elements)])  # local, labels are placeholders
+
+    contiguous_sets = [[x for x in sets if table.is_contiguous(x)] for sets in all_sets]
 
     contiguous_sets_flat = np.sum(contiguous_sets, dtype='object')
 
@@ -1,7 +1,7 @@
 import numpy as np
 from . import utils
 
-def distinction_str(distinction, pad=True, common_pad=True, forget=False, horizontal=True):
+def distinction_str(distinction, pad=True, common_pad=True, forget=False, horizontal=True, table=None):
     '''
     Returns str with mechanism representation.
 
@@ -13,13 +13,16 @@ def distinction_str(distinction, pad=True, common_pad=True, forget=False, horizo
     remove_pad : bool
     forget : bool
         Changes letters for x's
+    table : utils.MechanismTable (defaults to the shared table of the node labels)
     '''
     labels = distinction.node_labels
+    if table is None:
+        table = utils.get_mechanism_table(labels)
 
-    mech, cause, effect = utils.node_ixs2label(distinction.mechanism, labels), utils.node_ixs2label(distinction.cause_purview, labels), utils.node_ixs2label(distinction.effect_purview, labels)
+    mech, cause, effect = table.label(distinction.mechanism), table.purview_label(distinction.cause_purview), table.purview_label(distinction.effect_purview)
 
     if pad:
-        mech, cause, effect = pad_mech_label(mech, labels), pad_mech_label(cause, labels), pad_mech_label(effect, labels)
+        mech, cause, effect = pad_mech_label(mech, labels, table), pad_mech_label(cause, labels, table), pad_mech_label(effect, labels, table)
     if forget:
         mech, cause, effect = forget_str([mech, cause, effect])
 
@@ -33,7 +36,7 @@ def distinction_str(distinction, pad=True, common_pad=True, forget=False, horizo
         dash = '-' * n
         return f"{mech}\n{dash}\n{effect}\n{cause}"
 
-def pad_mech_label(label, node_labels):
+def pad_mech_label(label, node_labels, table=None):
     """
     Pad mechanism label str.
 
@@ -41,6 +44,7 @@ def pad_mech_label(label, node_labels):
     ----------
     node_ixs : str
     node_labels : pyphi.labels.NodeLabels
+    table : utils.MechanismTable (defaults to the shared table of the node labels)
 
     Returns
     -------
@@ -55,8 +59,7 @@ def pad_mech_label(label, node_labels):
     ' C D'
 
     """
-    s = " " * len(node_labels)
-    for c in label:
-        ix = node_labels.index(c)
-        s = s[:ix] + c + s[ix + 1:]
-    return s
\ No newline at end of file
+    if table is None:
+        table = utils.get_mechanism_table(node_labels)
+    mask = table.purview_mask(table.node_label2ix[c] for c in label)
+    return ''.join(c if mask >> ix & 1 else ' ' for ix, c in enumerate(table.node_labels))
\ No newline at end of file
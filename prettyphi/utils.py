@@ -58,7 +58,8 @@ def node_label2ixs(label, node_labels):
     >>> node_label2ixs('EDC', ['H', 'G', 'F', 'E', 'D', 'C', 'B', 'A'])
     (3, 4, 5)
     '''
-    return tuple([node_labels.index(s) for s in label])
+    node_label2ix = get_mechanism_table(node_labels).node_label2ix
+    return tuple(node_label2ix[s] for s in label)
 
 def nodes_ixs2label(nodes_ixs, node_labels):
     '''
@@ -74,4 +75,147 @@ def nodes_ixs2label(nodes_ixs, node_labels):
     list of str
 
     '''
-    return [node_ixs2label(ixs, node_labels) for ixs in nodes_ixs]
\ No newline at end of file
+    return [node_ixs2label(ixs, node_labels) for ixs in nodes_ixs]
+
+class MechanismTable:
+    '''
+    Interned table of the mechanisms of a subsystem.
+
+    Each mechanism, i.e. tuple of node indices, is interned once with an int id
+    together with its precomputed label, bitmask, size and contiguity flag.
+    Lookups are then dict accesses instead of recomputations.
+
+    Ids are assigned in interning order, so they are only stable within one table
+    instance and must not be used as persistent keys. Purviews should not be
+    interned (use purview_label and purview_mask instead).
+
+    Parameters
+    ----------
+    node_labels : list of str
+
+    Examples
+    --------
+    >>> table = MechanismTable(['A', 'B', 'C', 'D'])
+    >>> table.intern((1, 2))
+    0
+    >>> table.label((1, 2)), table.mask((1, 2)), table.is_contiguous((1, 3))
+    ('BC', 6, False)
+    >>> table.label2ixs('BD')
+    (1, 3)
+    '''
+
+    def __init__(self, node_labels):
+        self.node_labels = tuple(node_labels)
+        self.node_label2ix = {label: ix for ix, label in enumerate(self.node_labels)}
+
+        self.mechanisms = []  # id --> tuple of node indices
+        self.labels = []  # id --> str
+        self.masks = []  # id --> int bitmask over node indices
+        self.sizes = []  # id --> int
+        self.contiguous = []  # id --> bool
+
+        self._mech2id = {}
+        self._label2id = {}
+
+    def __len__(self):
+        return len(self.mechanisms)
+
+    def intern(self, mech):
+        '''
+        Returns the id of mechanism, adding it to the table if needed.
+
+        Parameters
+        ----------
+        mech : tuple of ints
+
+        Returns
+        -------
+        int
+        '''
+        mech = tuple(mech)
+        mech_id = self._mech2id.get(mech)
+        if mech_id is not None:
+            return mech_id
+
+        mech = tuple(int(ix) for ix in mech)
+        label = ''.join(self.node_labels[ix] for ix in mech)
+        mask = 0
+        for ix in mech:
+            mask |= 1 << ix
+
+        mech_id = len(self.mechanisms)
+        self.mechanisms.append(mech)
+        self.labels.append(label)
+        self.masks.append(mask)
+        self.sizes.append(len(mech))
+        self.contiguous.append(all(b - a == 1 for a, b in zip(mech, mech[1:])))
+
+        self._mech2id[mech] = mech_id
+        self._label2id.setdefault(label, mech_id)
+        return mech_id
+
+    def intern_label(self, label):
+        '''
+        Returns the id of the mechanism with given label, adding it to the table if needed.
+        '''
+        mech_id = self._label2id.get(label)
+        if mech_id is None:
+            mech_id = self.intern(self.node_label2ix[s] for s in label)
+        return mech_id
+
+    def label(self, mech):
+        return self.labels[self.intern(mech)]
+
+    def mask(self, mech):
+        return self.masks[self.intern(mech)]
+
+    def size(self, mech):
+        return self.sizes[self.intern(mech)]
+
+    def is_contiguous(self, mech):
+        return self.contiguous[self.intern(mech)]
+
+    def label2ixs(self, label):
+        return self.mechanisms[self.intern_label(label)]
+
+    def purview_label(self, purview):
+        '''
+        Returns label of purview (tuple of node indices) without interning it.
+        '''
+        return ''.join(self.node_labels[ix] for ix in purview)
+
+    def purview_mask(self, purview):
+        '''
+        Returns bitmask of purview (set of node indices) without interning it.
+        '''
+        return sum(1 << int(ix) for ix in set(purview))
+
+_MECHANISM_TABLES = {}
+
+def get_mechanism_table(node_labels):
+    '''
+    Returns the MechanismTable shared by all modules for a subsystem's node labels.
+
+    The shared table is process-wide and grows with every mechanism looked up in it,
+    so its ids and size depend on call history. Code that needs ids or an index over
+    a fixed set of mechanisms should use its own MechanismTable(node_labels).
+
+    Parameters
+    ----------
+    node_labels : list of str (or pyphi.labels.NodeLabels)
+
+    Returns
+    -------
+    MechanismTable
+    '''
+    key = tuple(node_labels)
+    table = _MECHANISM_TABLES.get(key)
+    if table is None:
+        table = _MECHANISM_TABLES[key] = MechanismTable(key)
+    return table
+
+def clear_mechanism_tables():
+    '''
+    Clears the shared mechanism tables (see get_mechanism_table).
+    '''
+    _MECHANISM_TABLES.clear()
@@ -0,0 +1,89 @@
+import networkx as nx
+import numpy as np
+
+from prettyphi import analysis, ces, utils
+
+
+def _small_ces():
+    CES = {4: nx.Graph(), 3: nx.MultiDiGraph(), 2: nx.MultiDiGraph()}
+    for G in CES.values():
+        G.add_nodes_from(['A', 'B', 'AB'])
+    CES[4].add_edge('AB', 'A', color='blue')
+    CES[3].add_edge('A', 'B', color='green')
+    CES[3].add_edge('A', 'B', color='green')
+    CES[3].add_edge('AB', 'B', color='red')
+    CES[2].add_edge('A', 'AB', color='orange')
+    CES[2].add_edge('B', 'A', color='green')
+    CES[2].add_edge('A', 'B', color='red')
+    return CES
+
+
+def test_ces_to_sparse_indexed_by_ces_nodes():
+    utils.get_mechanism_table(['A', 'B']).intern((1, 0))  # unrelated shared-table entry
+    mechanisms, sCES = analysis.ces_to_sparse(_small_ces())
+    assert mechanisms == ['A', 'B', 'AB']
+    a, b, ab = range(3)
+
+    assert set(sCES[3]) == {'green', 'red'}
+    assert sCES[3]['green'][a, b] == 2
+    assert sCES[3]['red'][ab, b] == 1
+    assert all(A.shape == (3, 3) for dA in sCES.values() for A in dA.values())
+
+
+def test_ces_to_sparse_without_colors():
+    _, sCES = analysis.ces_to_sparse(_small_ces(), facecolor_attribute=None)
+    assert all(set(dA) == {None} for dA in sCES.values())
+    assert analysis.face_counts(sCES) == {4: {None: 1}, 3: {None: 3}, 2: {None: 3}}
+    assert analysis.sum_adjacency(sCES).sum() == 7
+
+
+def test_decomposed_ces_to_sparse():
+    dCES = ces.decompose_ces_by_facecolor(_small_ces())
+    _, sCES = analysis.decomposed_ces_to_sparse(dCES)
+    assert analysis.face_counts(sCES) == {4: {'blue': 1},
+                                          3: {'green': 2, 'red': 1},
+                                          2: {'green': 1, 'red': 1, 'orange': 1}}
+
+
+def test_degrees():
+    CES = _small_ces()
+    mechanisms, sCES = analysis.ces_to_sparse(CES)
+    a, b, ab = range(3)
+
+    A = sCES[3]['green']
+    assert list(analysis.out_degrees(A)[[a, b, ab]]) == [2, 0, 0]
+    assert list(analysis.in_degrees(A)[[a, b, ab]]) == [0, 2, 0]
+
+    A = analysis.sum_adjacency(sCES, face_degrees=[2])
+    expected = dict(CES[2].degree)
+    assert {m: analysis.degrees(A)[mechanisms.index(m)] for m in expected} == expected
+    assert list(analysis.degree_distribution(A)) == [0, 1, 1, 1]
+
+
+def test_symmetrize():
+    _, sCES = analysis.ces_to_sparse(_small_ces())
+    S = analysis.symmetrize(sCES[4]['blue']).toarray()
+    assert np.array_equal(S, S.T)
+    assert S.sum() == 2
+    assert analysis.symmetrize(analysis.sparse.csr_matrix(np.eye(2, dtype=int))).sum() == 2
+
+
+def test_connected_components():
+    CES = _small_ces()
+    CES[3].add_node('C')
+    _, sCES = analysis.ces_to_sparse(CES)
+    A = analysis.sum_adjacency(sCES, face_degrees=[3])
+    n_components, labels = analysis.connected_components(A)
+    assert n_components == 2
+    assert list(analysis.component_sizes(A)) == [3, 1]
+
+
+def test_undirected_faces_in_upper_triangle():
+    G = nx.MultiGraph()
+    G.add_nodes_from(['A', 'B', 'AB'])
+    G.add_edge('AB', 'A')
+    G.add_edge('B', 'A')
+    G.add_edge('B', 'A')
+    A = analysis.graph_to_sparse(G, ['A', 'B', 'AB'])[None]
+    assert A[0, 2] == 1 and A[0, 1] == 2
+    assert analysis.sparse.tril(A, k=-1).nnz == 0
@@ -0,0 +1,46 @@
+import xml.etree.ElementTree as ET
+
+import networkx as nx
+
+from prettyphi import ces, drawing, layout
+
+SVG = '{http://www.w3.org/2000/svg}'
+
+
+def _small_dces():
+    CES = {4: nx.Graph(), 3: nx.MultiDiGraph(), 2: nx.MultiDiGraph()}
+    for G in CES.values():
+        G.add_nodes_from(['A', 'B', 'AB'])
+    CES[4].add_edge('AB', 'A', color='blue')
+    CES[3].add_edge('A', 'B', color='green')
+    CES[3].add_edge('AB', 'B', color='red')
+    CES[3].add_edge('AB', 'AB', color='red')
+    CES[2].add_edge('A', 'AB', color='orange')
+    CES[2].add_edge('B', 'A', color='green')
+    return ces.decompose_ces_by_facecolor(CES)
+
+
+def test_save_decomposed_facecolor_ces_svg(tmp_path):
+    dCES = _small_dces()
+    pos = {'A': (0, 1), 'B': (1, 1), 'AB': (0.5, 2)}
+    fpath = tmp_path / 'ces.svg'
+    drawing.save_decomposed_facecolor_ces_svg(dCES, pos, fpath, pos_labels=layout.offset_pos(pos, y=0.2),
+                                              edgecolor_field='color')
+
+    root = ET.parse(fpath).getroot()
+    panels = root.findall(f'{SVG}g')
+    assert len(panels) == 6  # 1 + 2 + 3 panels
+
+    lines = root.findall(f'.//{SVG}line')
+    loops = root.findall(f'.//{SVG}path[@fill="none"]')
+    circles = root.findall(f'.//{SVG}circle')
+    assert len(lines) == 5
+    assert len(loops) == 1
+    assert len(circles) == 5 * 3  # empty cause-cause 2-face panel has no nodes
+
+    # one arrow marker per stroke color of directed edges, filled with that color
+    markers = {m.get('id'): m.find(f'{SVG}path').get('fill') for m in root.iter(f'{SVG}marker')}
+    assert markers == {'arrow-008000': '#008000', 'arrow-ff0000': '#ff0000', 'arrow-ffa500': '#ffa500'}
+    for line in lines:
+        if line.get('marker-end') is not None:
+            assert line.get('marker-end') == f"url(#arrow-{line.get('stroke')[1:]})"
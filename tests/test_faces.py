@@ -0,0 +1,212 @@
+import itertools
+import random
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from prettyphi import analysis, ces, utils
+
+CES_DIR = Path(__file__).resolve().parent.parent / 'example_ces'
+NODE_LABELS = ('A', 'B', 'C', 'D')
+
+
+# Minimal stand-ins for pyphi distinctions, purviews, faces and relations
+
+class Direction:
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return self.name
+
+CAUSE, EFFECT = Direction('CAUSE'), Direction('EFFECT')
+
+class Purview(tuple):
+    def __new__(cls, ixs, mechanism, direction):
+        p = super().__new__(cls, ixs)
+        p.mechanism, p.direction = mechanism, direction
+        return p
+
+class Face(list):
+    def __init__(self, purviews):
+        super().__init__(purviews)
+        self.purview = frozenset.intersection(*(frozenset(p) for p in purviews))
+
+class Relation(list):
+    def __init__(self, distinctions, faces):
+        super().__init__(distinctions)
+        self.faces = faces
+
+class Distinction:
+    def __init__(self, mechanism, cause_purview, effect_purview):
+        self.mechanism, self.node_labels, self.phi = mechanism, NODE_LABELS, 1.
+        self.cause_purview, self.effect_purview = cause_purview, effect_purview
+
+
+def _random_ces(seed=0, n_distinctions=10):
+    rng = random.Random(seed)
+    mechs = [m for n in range(1, len(NODE_LABELS) + 1) for m in itertools.combinations(range(len(NODE_LABELS)), n)]
+
+    def _purview():
+        return tuple(sorted(rng.sample(range(len(NODE_LABELS)), rng.randint(1, len(NODE_LABELS)))))
+
+    distinctions = [Distinction(m, _purview(), _purview()) for m in rng.sample(mechs, n_distinctions)]
+
+    relations = []
+    for d1, d2 in itertools.combinations(distinctions, 2):
+        purviews = [Purview(d.cause_purview, d.mechanism, CAUSE) for d in (d1, d2)] \
+                   + [Purview(d.effect_purview, d.mechanism, EFFECT) for d in (d1, d2)]
+        faces = []
+        for k in range(2, 5):
+            for face_purviews in itertools.combinations(purviews, k):
+                if len({p.mechanism for p in face_purviews}) < 2:
+                    continue
+                face_purviews = list(face_purviews)
+                rng.shuffle(face_purviews)  # purview order within faces is arbitrary
+                face = Face(face_purviews)
+                if face.purview:
+                    faces.append(face)
+        rng.shuffle(faces)
+        if faces:
+            relations.append(Relation(rng.sample([d1, d2], 2), faces))
+    return distinctions, relations
+
+
+def _load_example_ces():
+    try:
+        distinctions = [utils.load_pickle(p) for p in sorted(CES_DIR.glob('d_*.pkl'))]
+        relations = utils.load_pickle(CES_DIR / 'relations_maxdegree_2.pkl')
+    except (ImportError, AttributeError) as e:
+        pytest.skip(f'example CES needs a compatible pyphi ({e})')
+    return distinctions, ces.filter_relations_by_degree(relations, 2)
+
+
+def _create_ces_graph_per_relation(distinctions, relations, invert_3face_edge=True):
+    '''Per-relation loop of create_ces_graph before face arrays, as reference.'''
+    CES = {4: nx.Graph(), 3: nx.MultiDiGraph(), 2: nx.MultiDiGraph()}
+    for G in CES.values():
+        for d in distinctions:
+            label = utils.node_ixs2label(d.mechanism, d.node_labels)
+            G.add_node(label, phi=d.phi, node_indices=d.mechanism, node_label=label)
+
+    for rel in ces.filter_relations_by_degree(relations, 2):
+        distinction1, distinction2 = list(rel)
+        mech1, mech2 = distinction1.mechanism, distinction2.mechanism
+        label1, label2 = utils.nodes_ixs2label([mech1, mech2], distinction1.node_labels)
+        for face in sorted(list(rel.faces), key=len, reverse=True):
+            if len(face) == 4:
+                CES[4].add_edge(label1, label2, color='blue', purview=face.purview)
+            elif len(face) == 3:
+                color = 'green' if ces.eval_rel_3face_type(face) == 'effect' else 'red'
+                base_is_mech1 = ces.eval_rel_3face_base(face) == mech1
+                if base_is_mech1 != invert_3face_edge:
+                    CES[3].add_edge(label1, label2, color=color, purview=face.purview)
+                else:
+                    CES[3].add_edge(label2, label1, color=color, purview=face.purview)
+            elif len(face) == 2:
+                face_type = ces.eval_rel_2face_type(face)
+                color = {'effect_effect': 'green', 'cause_cause': 'red'}.get(face_type, 'orange')
+                if face_type == 'effect_cause':
+                    CES[2].add_edge(label2, label1, color=color, purview=face.purview)
+                else:
+                    CES[2].add_edge(label1, label2, color=color, purview=face.purview)
+    return CES
+
+
+def _edge_multiset(G):
+    return sorted((u, v, d['color'], sorted(d['purview'])) for u, v, d in G.edges(data=True))
+
+
+@pytest.fixture(params=['random', 'example'])
+def ces_data(request):
+    if request.param == 'example':
+        return _load_example_ces()
+    return _random_ces()
+
+
+def test_classify_faces_agrees_with_per_face_functions(ces_data):
+    _, relations = ces_data
+    faces = ces.classify_faces(relations)
+
+    all_faces = [face for rel in relations for face in rel.faces]
+    assert len(all_faces) == len(faces['degree'])
+
+    types2 = ces.faces_2face_type(faces)
+    types3 = ces.faces_3face_type(faces)
+    for k, face in enumerate(all_faces):
+        assert faces['degree'][k] == len(face)
+        assert faces['purview_mask'][k] == sum(1 << ix for ix in face.purview)
+        assert faces['purview'][k] == face.purview
+        if len(face) == 2:
+            assert types2[k] == ces.eval_rel_2face_type(face)
+        if len(face) == 3:
+            assert types3[k] == ces.eval_rel_3face_type(face)
+            assert faces['mechanisms'][faces['base_mech_id'][k]] == ces.eval_rel_3face_base(face)
+        else:
+            assert faces['base_mech_id'][k] == -1
+
+
+def test_classify_faces_local_mechanism_ids():
+    distinctions, relations = _random_ces()
+    utils.clear_mechanism_tables()
+    faces = ces.classify_faces(relations)
+    assert set(faces['mechanisms']) == {d.mechanism for rel in relations for d in rel}
+    assert len(utils.get_mechanism_table(NODE_LABELS)) == 0
+
+
+def test_classify_faces_base_of_3relation_faces():
+    d1, d2, d3 = (Distinction(m, (0, 1), (0, 1)) for m in [(0,), (1,), (2,)])
+    p1c, p2c, p3e = Purview((0, 1), d1.mechanism, CAUSE), Purview((0, 1), d2.mechanism, CAUSE), Purview((0, 1), d3.mechanism, EFFECT)
+    p1e = Purview((0, 1), d1.mechanism, EFFECT)
+    relation = Relation([d1, d2, d3], [Face([p1c, p2c, p3e]), Face([p2c, p1c, p1e])])
+    faces = ces.classify_faces([relation])
+    assert faces['base_mech_id'][0] == -1  # three distinct mechanisms
+    assert faces['mechanisms'][faces['base_mech_id'][1]] == d1.mechanism
+    assert list(faces['mech1_id']) == [-1, -1]
+
+
+@pytest.mark.parametrize('invert_3face_edge', [True, False])
+def test_create_ces_graph_from_faces(ces_data, invert_3face_edge):
+    distinctions, relations = ces_data
+    expected = _create_ces_graph_per_relation(distinctions, relations, invert_3face_edge=invert_3face_edge)
+    faces = ces.classify_faces(relations)
+    CES = ces.create_ces_graph(distinctions, faces=faces, invert_3face_edge=invert_3face_edge)
+
+    for n in [4, 3, 2]:
+        assert list(CES[n].nodes(data=True)) == list(expected[n].nodes(data=True))
+        if ces.is_multi_graph(CES[n]):
+            assert list(CES[n].edges(keys=True, data=True)) == list(expected[n].edges(keys=True, data=True))
+        else:
+            assert list(CES[n].edges(data=True)) == list(expected[n].edges(data=True))
+
+
+def test_filter_faces_by_higher_face_purview_overlap(ces_data):
+    distinctions, relations = ces_data
+    faces = ces.classify_faces(relations)
+    expected = ces.filter_ces_by_higher_face_purview_overlap(ces.create_ces_graph(distinctions, faces=faces))
+
+    filtered_faces = ces.filter_faces_by_higher_face_purview_overlap(faces)
+    CES = ces.create_ces_graph(distinctions, faces=filtered_faces)
+    for n in [4, 3, 2]:
+        assert _edge_multiset(CES[n]) == _edge_multiset(expected[n])
+
+
+@pytest.mark.parametrize('invert_3face_edge', [True, False])
+def test_faces_to_sparse(ces_data, invert_3face_edge):
+    distinctions, relations = ces_data
+    faces = ces.classify_faces(relations)
+    CES = ces.create_ces_graph(distinctions, faces=faces, invert_3face_edge=invert_3face_edge)
+    mechanisms, expected = analysis.ces_to_sparse(CES)
+
+    _, sCES = analysis.faces_to_sparse(faces, mechanisms=mechanisms, invert_3face_edge=invert_3face_edge)
+    assert sCES.keys() == expected.keys()
+    for n in expected:
+        assert sCES[n].keys() == expected[n].keys()
+        for c in expected[n]:
+            assert (sCES[n][c] != expected[n][c]).nnz == 0
+
+    face_mechanisms, sCES = analysis.faces_to_sparse(faces)
+    assert len(face_mechanisms) == len(faces['mechanisms'])
+    assert analysis.face_counts(sCES) == analysis.face_counts(expected)
@@ -0,0 +1,40 @@
+from prettyphi import utils
+
+NODE_LABELS = ['H', 'G', 'F', 'E', 'D', 'C', 'B', 'A']
+
+
+def test_mechanism_table_entries():
+    table = utils.MechanismTable(['A', 'B', 'C', 'D'])
+    mech_id = table.intern((1, 2))
+    assert table.intern((1, 2)) == mech_id
+    assert table.mechanisms[mech_id] == (1, 2)
+    assert table.labels[mech_id] == 'BC'
+    assert table.masks[mech_id] == 0b0110
+    assert table.sizes[mech_id] == 2
+    assert table.contiguous[mech_id]
+    assert not table.is_contiguous((1, 3))
+    assert table.intern_label('BC') == mech_id
+    assert table.label2ixs('BD') == (1, 3)
+
+
+def test_purviews_are_not_interned():
+    table = utils.MechanismTable(['A', 'B', 'C', 'D'])
+    assert table.purview_label((0, 3)) == 'AD'
+    assert table.purview_mask({0, 3}) == 0b1001
+    assert len(table) == 0
+
+
+def test_label_conversions():
+    utils.clear_mechanism_tables()
+    assert utils.node_ixs2label((3, 4, 5), NODE_LABELS) == 'EDC'
+    assert utils.node_label2ixs('EDC', NODE_LABELS) == (3, 4, 5)
+    assert utils.nodes_ixs2label([(0,), (6, 7)], NODE_LABELS) == ['H', 'BA']
+    assert len(utils.get_mechanism_table(NODE_LABELS)) == 0  # conversions do not intern
+
+
+def test_shared_tables():
+    utils.clear_mechanism_tables()
+    table = utils.get_mechanism_table(NODE_LABELS)
+    assert utils.get_mechanism_table(tuple(NODE_LABELS)) is table
+    utils.clear_mechanism_tables()
+    assert utils.get_mechanism_table(NODE_LABELS) is not table